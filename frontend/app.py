@@ -23,11 +23,18 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import concurrent.futures
+import functools
+import html
 import json
-from datetime import datetime
+from collections import Counter
+from datetime import datetime, timezone
 
 import duckdb
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.feather as feather
 import streamlit as st
 
 from src.config import (
@@ -47,31 +54,29 @@ st.set_page_config(
 
 # ─── Design tokens ────────────────────────────────────────────────────────────
 
-SEVERITY_COLORS = {
-    "CRITICAL": "#dc2626",
-    "HIGH":     "#ea580c",
-    "MEDIUM":   "#d97706",
-    "LOW":      "#16a34a",
-    "OK":       "#16a34a",
-}
-SEVERITY_BG = {
-    "CRITICAL": "#fef2f2",
-    "HIGH":     "#fff7ed",
-    "MEDIUM":   "#fffbeb",
-    "LOW":      "#f0fdf4",
-    "OK":       "#f0fdf4",
-}
-SEVERITY_BORDER = {
-    "CRITICAL": "#fca5a5",
-    "HIGH":     "#fdba74",
-    "MEDIUM":   "#fcd34d",
-    "LOW":      "#86efac",
-    "OK":       "#86efac",
+# severity: (text color, background, border) — one dict, one lookup
+SEVERITY_STYLE = {
+    "CRITICAL": ("#dc2626", "#fef2f2", "#fca5a5"),
+    "HIGH":     ("#ea580c", "#fff7ed", "#fdba74"),
+    "MEDIUM":   ("#d97706", "#fffbeb", "#fcd34d"),
+    "LOW":      ("#16a34a", "#f0fdf4", "#86efac"),
+    "OK":       ("#16a34a", "#f0fdf4", "#86efac"),
 }
+SEVERITY_COLORS = {sev: c for sev, (c, _, _) in SEVERITY_STYLE.items()}
+SEVERITY_RANK = {"OK": -1, "LOW": 0, "MEDIUM": 1, "HIGH": 2, "CRITICAL": 3}
+
+# PIPELINE_EDGES is a config constant, so the node set never changes at runtime
+_ALL_LINEAGE_NODES = tuple(sorted(
+    {e["source"] for e in PIPELINE_EDGES} | {e["target"] for e in PIPELINE_EDGES}
+))
 
 # ─── Global CSS ───────────────────────────────────────────────────────────────
+# Held as a module constant so reruns re-emit the same interned string
+# instead of rebuilding the ~10KB literal. (A session_state "inject once"
+# gate would not work here: Streamlit clears elements that are not
+# re-emitted on a full rerun, taking the styles with them.)
 
-st.markdown("""
+_CSS = """
 <style>
 @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&display=swap');
 
@@ -538,6 +543,13 @@ hr {
     color: #22c55e !important;
 }
 
+.pipe-grid {
+    display: grid;
+    grid-template-columns: 5fr 1fr 5fr 1fr 5fr;
+    gap: 8px;
+    align-items: stretch;
+    margin-bottom: 10px;
+}
 .pipe-arrow {
     display: flex;
     align-items: center;
@@ -547,110 +559,265 @@ hr {
     padding-top: 55px;
 }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(_CSS, unsafe_allow_html=True)
 
 
 # ─── Internal helpers ─────────────────────────────────────────────────────────
+# Each loader/endpoint is cached with st.cache_data keyed on a file
+# signature (mtime, size), so warm reruns are dict lookups and on-disk
+# edits invalidate immediately without waiting out the TTL.
 
-def _load_json(path):
+def _file_sig(path):
+    """(mtime, size) of a file, or None if it doesn't exist — passed as a
+    cache key so the caches below invalidate when the file changes."""
+    try:
+        s = os.stat(path)
+        return (s.st_mtime, s.st_size)
+    except OSError:
+        return None
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_json(path, sig=None):
     if not os.path.exists(path):
         return []
     with open(path) as f:
         return json.load(f)
 
 
-def _load_csv(path):
-    if not os.path.exists(path):
+def _cell(v):
+    """Matches the old fillna("")/to_json record shape: nulls become empty
+    strings and Arrow-parsed timestamps go back to ISO strings."""
+    if v is None:
+        return ""
+    if isinstance(v, datetime):
+        return v.isoformat()
+    return v
+
+
+def _feather_sibling(path):
+    return os.path.splitext(path)[0] + ".feather"
+
+
+@st.cache_resource(show_spinner=False)
+def _duck() -> duckdb.DuckDBPyConnection:
+    """One read-only DuckDB connection for the lifetime of the process —
+    reconnecting on every rerun paid file-open + WAL replay each time."""
+    return duckdb.connect(DB_PATH, read_only=True, config={
+        "threads": str(os.cpu_count() or 4),
+        "memory_limit": "1GB",
+    })
+
+
+def _release_duck():
+    """Close and drop the cached read-only connection. DuckDB refuses to
+    open the same file with a different config in one process, so the
+    monitor runs (which connect read-write) need the handle released."""
+    _duck().close()
+    _duck.clear()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_csv(path, sig=None, columns=None):
+    # Prefer the Feather sibling written by the monitors — its on-disk
+    # layout matches the in-memory buffers, so loading is close to memcpy.
+    # `columns` pushes projection into the reader: only those buffers are
+    # decoded and materialized.
+    fpath = _feather_sibling(path)
+    if os.path.exists(fpath) and (
+        not os.path.exists(path) or os.path.getmtime(fpath) >= os.path.getmtime(path)
+    ):
+        table = feather.read_table(fpath, columns=list(columns) if columns else None)
+    elif os.path.exists(path):
+        # Arrow's multithreaded C++ CSV parser, straight to list-of-dicts —
+        # no pandas intermediate, no to_json/json.loads round-trip
+        table = pacsv.read_csv(
+            path,
+            read_options=pacsv.ReadOptions(use_threads=True),
+            convert_options=pacsv.ConvertOptions(include_columns=list(columns))
+            if columns else None,
+        )
+    else:
         return []
-    df = pd.read_csv(path)
-    return json.loads(df.fillna("").to_json(orient="records"))
+    return [{k: _cell(v) for k, v in row.items()} for row in table.to_pylist()]
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _summary(sigs=None):
+    # All counters in one DuckDB statement — the files are scanned by
+    # DuckDB's parallel CSV/JSON readers instead of Python loops over
+    # lists of dicts. Missing files contribute a literal 0.
+    def count_expr(path, reader, where=""):
+        if not os.path.exists(path):
+            return "0"
+        return f"(SELECT COUNT(*) FROM {reader}('{path}'){where})"
+
+    sql = "SELECT " + ", ".join([
+        count_expr(ANOMALY_PATH, "read_csv_auto") + " AS anomalies_total",
+        count_expr(ANOMALY_PATH, "read_csv_auto",
+                   " WHERE severity = 'CRITICAL'") + " AS anomalies_critical",
+        count_expr(SCHEMA_PATH, "read_csv_auto") + " AS schema_drift_events",
+        count_expr(TESTS_JSON, "read_json_auto") + " AS tests_generated",
+        count_expr(REPORTS_PATH, "read_json_auto") + " AS reports_generated",
+    ])
+    row = _duck().execute(sql).fetchone()
+    return {
+        "tables_monitored":    len(TABLES),
+        "anomalies_total":     row[0],
+        "anomalies_critical":  row[1],
+        "schema_drift_events": row[2],
+        "tests_generated":     row[3],
+        "reports_generated":   row[4],
+    }
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _tables(db_sig=None):
+    # Two set-based queries instead of a COUNT(*) + DESCRIBE round-trip
+    # per table
+    con = _duck()
+    counts_sql = " UNION ALL ".join(
+        f"SELECT '{t}' AS table_name, COUNT(*) AS row_count FROM {t}" for t in TABLES
+    )
+    row_counts = dict(con.execute(counts_sql).fetchall())
+    col_counts = dict(con.execute(
+        "SELECT table_name, COUNT(*) FROM information_schema.columns GROUP BY table_name"
+    ).fetchall())
+    results = [{"table": t, "row_count": row_counts.get(t, 0),
+                "col_count": col_counts.get(t, 0)} for t in TABLES]
+    return {"tables": results, "total": len(results)}
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _table_schema(table_name, db_sig=None, history_sig=None):
+    # Allow-list the table name — it comes from the URL-style path, and a
+    # parameterized catalog query lets DuckDB reuse its plan across tables
+    if table_name not in TABLES:
+        return None
+    rows = _duck().execute(
+        'SELECT column_name, data_type AS column_type, is_nullable AS "null" '
+        "FROM information_schema.columns WHERE table_name = ? "
+        "ORDER BY ordinal_position",
+        [table_name],
+    ).fetchall()
+    current_schema = [
+        {"column_name": name, "column_type": dtype, "null": nullable}
+        for name, dtype, nullable in rows
+    ]
+    drift_history = []
+    if os.path.exists(SCHEMA_PATH):
+        # Push the table filter into DuckDB's CSV scan — only matching rows
+        # are materialized, instead of the whole history plus a boolean mask
+        hist = _duck().execute(
+            'SELECT * FROM read_csv_auto(?) WHERE "table" = ?',
+            [SCHEMA_PATH, table_name],
+        ).fetch_arrow_table()
+        drift_history = [{k: _cell(v) for k, v in row.items()}
+                         for row in hist.to_pylist()]
+    return {"table": table_name, "current_schema": current_schema,
+            "drift_history": drift_history, "drift_count": len(drift_history)}
+
+
+def _anomalies():
+    # The Dashboard widget only shows these five fields, so skip decoding
+    # the rest of the history's columns entirely
+    anomalies = _load_csv(ANOMALY_PATH, _file_sig(ANOMALY_PATH),
+                          columns=("table", "column", "metric", "severity", "pct_change"))
+    counts = Counter(a.get("severity") for a in anomalies)
+    return {"anomalies": anomalies, "recent": anomalies[-6:],
+            "total": len(anomalies),
+            "critical": counts.get("CRITICAL", 0),
+            "high":     counts.get("HIGH", 0),
+            "medium":   counts.get("MEDIUM", 0)}
+
+
+def _reports():
+    reports = _load_json(REPORTS_PATH, _file_sig(REPORTS_PATH))
+    return {"reports": reports, "total": len(reports)}
+
+
+def _tests():
+    tests = _load_json(TESTS_JSON, _file_sig(TESTS_JSON))
+    by_table = Counter(t.get("table", "unknown") for t in tests)
+    return {"tests": tests, "total": len(tests), "by_table": dict(by_table)}
+
+
+@st.cache_data(show_spinner=False)
+def _lineage_html(path, sig=None):
+    """Cached read of the pyvis HTML export; sig keys the cache to the file."""
+    with open(path, "r") as f:
+        return f.read()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _test_indices(sig=None):
+    """Prebuilt filter indices for the Tests page — selectbox changes index
+    into these dicts instead of rescanning the full test list twice."""
+    tests = _load_json(TESTS_JSON, sig)
+    by_table, by_type, by_pair = {}, {}, {}
+    for t in tests:
+        table, ttype = t.get("table", "unknown"), t.get("test_type", "")
+        by_table.setdefault(table, []).append(t)
+        by_type.setdefault(ttype, []).append(t)
+        by_pair.setdefault((table, ttype), []).append(t)
+    types_for = {tbl: sorted({t["test_type"] for t in lst})
+                 for tbl, lst in by_table.items()}
+    types_for["All"] = sorted(by_type)
+    return {"all": tests, "by_table": by_table, "by_type": by_type,
+            "by_pair": by_pair, "table_names": sorted(by_table),
+            "types_for": types_for}
+
+
+def _lineage():
+    reports = _load_json(REPORTS_PATH, _file_sig(REPORTS_PATH))
+    anomalous = {}
+    for r in reports:
+        table    = r.get("table")
+        severity = r.get("severity", "LOW")
+        if table and SEVERITY_RANK[severity] > SEVERITY_RANK[anomalous.get(table, "OK")]:
+            anomalous[table] = severity
+    nodes = [{"id": n, "label": n, "severity": anomalous.get(n, "OK"),
+              "healthy": n not in anomalous} for n in _ALL_LINEAGE_NODES]
+    return {"nodes": nodes, "edges": PIPELINE_EDGES, "anomalous_count": len(anomalous)}
 
 
 def _get(path):
     if path == "/":
         return {"status": "healthy"}
-
     if path == "/api/summary":
-        anomalies = _load_csv(ANOMALY_PATH)
-        reports   = _load_json(REPORTS_PATH)
-        tests     = _load_json(TESTS_JSON)
-        drift_count = 0
-        if os.path.exists(SCHEMA_PATH):
-            drift_count = len(pd.read_csv(SCHEMA_PATH))
-        return {
-            "tables_monitored":    len(TABLES),
-            "anomalies_total":     len(anomalies),
-            "anomalies_critical":  sum(1 for a in anomalies if a.get("severity") == "CRITICAL"),
-            "schema_drift_events": drift_count,
-            "tests_generated":     len(tests),
-            "reports_generated":   len(reports),
-        }
-
+        return _summary(tuple(_file_sig(p) for p in
+                              (ANOMALY_PATH, SCHEMA_PATH, TESTS_JSON, REPORTS_PATH)))
+    if path == "/api/dashboard":
+        # Everything the Dashboard page needs in one response — one
+        # dispatch instead of four separate fetches per render
+        return {"summary":   _get("/api/summary"),
+                "tables":    _get("/api/tables"),
+                "reports":   _reports(),
+                "anomalies": _anomalies()}
     if path == "/api/tables":
-        con = duckdb.connect(DB_PATH, read_only=True)
-        results = []
-        for table in TABLES:
-            row_count = con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
-            col_count = len(con.execute(f"DESCRIBE {table}").df())
-            results.append({"table": table, "row_count": row_count, "col_count": col_count})
-        con.close()
-        return {"tables": results, "total": len(results)}
-
+        return _tables(_file_sig(DB_PATH))
     if path.startswith("/api/tables/") and path.endswith("/schema"):
-        table_name = path.split("/")[3]
-        con = duckdb.connect(DB_PATH, read_only=True)
-        schema_df = con.execute(f"DESCRIBE {table_name}").df()
-        con.close()
-        current_schema = json.loads(schema_df.fillna("").to_json(orient="records"))
-        drift_history = []
-        if os.path.exists(SCHEMA_PATH):
-            df = pd.read_csv(SCHEMA_PATH)
-            table_drift = df[df["table"] == table_name]
-            drift_history = json.loads(table_drift.fillna("").to_json(orient="records"))
-        return {"table": table_name, "current_schema": current_schema,
-                "drift_history": drift_history, "drift_count": len(drift_history)}
-
+        return _table_schema(path.split("/")[3], _file_sig(DB_PATH), _file_sig(SCHEMA_PATH))
     if path == "/api/anomalies":
-        anomalies = _load_csv(ANOMALY_PATH)
-        return {"anomalies": anomalies, "total": len(anomalies),
-                "critical": sum(1 for a in anomalies if a.get("severity") == "CRITICAL"),
-                "high":     sum(1 for a in anomalies if a.get("severity") == "HIGH"),
-                "medium":   sum(1 for a in anomalies if a.get("severity") == "MEDIUM")}
-
+        return _anomalies()
     if path == "/api/reports":
-        reports = _load_json(REPORTS_PATH)
-        return {"reports": reports, "total": len(reports)}
-
+        return _reports()
     if path == "/api/tests":
-        tests = _load_json(TESTS_JSON)
-        by_table = {}
-        for t in tests:
-            by_table.setdefault(t.get("table", "unknown"), []).append(t)
-        return {"tests": tests, "total": len(tests),
-                "by_table": {t: len(v) for t, v in by_table.items()}}
-
+        return _tests()
     if path == "/api/lineage":
-        reports = _load_json(REPORTS_PATH)
-        anomalous = {}
-        for r in reports:
-            table    = r.get("table")
-            severity = r.get("severity", "LOW")
-            if table:
-                priority = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
-                existing = anomalous.get(table, "OK")
-                if existing == "OK" or priority.index(severity) > priority.index(existing):
-                    anomalous[table] = severity
-        all_nodes = set()
-        for edge in PIPELINE_EDGES:
-            all_nodes.add(edge["source"])
-            all_nodes.add(edge["target"])
-        nodes = [{"id": n, "label": n, "severity": anomalous.get(n, "OK"),
-                  "healthy": n not in anomalous} for n in all_nodes]
-        return {"nodes": nodes, "edges": PIPELINE_EDGES, "anomalous_count": len(anomalous)}
-
+        return _lineage()
     return None
 
 
+@st.cache_data(ttl=5, show_spinner=False)
+def _ping() -> bool:
+    """Cheap health check backing the sidebar status badge — cached so
+    page navigation doesn't re-probe the warehouse on every rerun."""
+    return os.path.exists(DB_PATH) and _get("/").get("status") == "healthy"
+
+
 def api_get(path):
     try:
         return _get(path)
@@ -659,29 +826,77 @@ def api_get(path):
         return None
 
 
-def api_post(path):
+@st.cache_resource(show_spinner=False)
+def _pool():
+    """Shared worker pool for pipeline runs — the LLM and Slack calls are
+    I/O-bound, so threads are enough to keep the UI responsive."""
+    return concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+
+def _now():
+    """Timestamp for run results — timezone-aware, no deprecated utcnow."""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+@functools.lru_cache(maxsize=None)
+def _load_schema_monitor():
+    """Deferred import — only pay for the monitor's dependency chain when
+    a run is actually triggered."""
     from src.monitoring.schema_monitor import run_schema_monitor
+    return run_schema_monitor
+
+
+@functools.lru_cache(maxsize=None)
+def _load_anomaly_detector():
     from src.monitoring.anomaly_detector import run_anomaly_detector
+    return run_anomaly_detector
+
+
+def _run_full_pipeline():
+    """Runs analyzer + alerts; executed on the worker pool, so no st.* calls."""
+    from src.llm.root_cause_analyzer import run_root_cause_analyzer
+    from src.alerts.slack_alerts import run_slack_alerts
+    reports = run_root_cause_analyzer()
+    if reports:
+        run_slack_alerts()
+    return {"status": "success",
+            "message": f"Full pipeline complete — {len(reports)} report(s) generated",
+            "count": len(reports), "ran_at": _now()}
+
+
+def _invalidate(*cached_fns):
+    """Surgically drops the caches a run just made stale. The file-signature
+    keys catch most changes on their own, but (mtime, size) can collide on
+    sub-second rewrites — an explicit clear guarantees the next api_get
+    reads fresh. Never touches _duck (a cache_resource)."""
+    for fn in cached_fns:
+        fn.clear()
+
+
+def api_post(path):
+    _release_duck()
     try:
         if path == "/api/run/schema-monitor":
-            drifts = run_schema_monitor(verbose=False)
+            drifts = _load_schema_monitor()(verbose=False)
+            _invalidate(_load_csv, _table_schema, _summary)
             return {"status": "success",
                     "message": f"Schema monitor complete — {len(drifts)} drift event(s) detected",
-                    "count": len(drifts), "ran_at": datetime.utcnow().isoformat()}
+                    "count": len(drifts), "ran_at": _now()}
         if path == "/api/run/anomaly-detector":
-            anomalies = run_anomaly_detector(verbose=False)
+            anomalies = _load_anomaly_detector()(verbose=False)
+            _invalidate(_load_csv, _summary)
             return {"status": "success",
                     "message": f"Anomaly detector complete — {len(anomalies)} anomaly(s) detected",
-                    "count": len(anomalies), "ran_at": datetime.utcnow().isoformat()}
+                    "count": len(anomalies), "ran_at": _now()}
         if path == "/api/run/full-pipeline":
-            from src.llm.root_cause_analyzer import run_root_cause_analyzer
-            from src.alerts.slack_alerts import run_slack_alerts
-            reports = run_root_cause_analyzer()
-            if reports:
-                run_slack_alerts()
-            return {"status": "success",
-                    "message": f"Full pipeline complete — {len(reports)} report(s) generated",
-                    "count": len(reports), "ran_at": datetime.utcnow().isoformat()}
+            # Dispatch to the pool instead of blocking the session under a
+            # spinner; the Run Pipeline page polls the future for completion
+            if "pipeline_job" not in st.session_state:
+                st.session_state.pop("pipeline_result", None)
+                st.session_state["pipeline_job"] = _pool().submit(_run_full_pipeline)
+            return {"status": "started",
+                    "message": "Full pipeline started in the background",
+                    "count": 0, "ran_at": _now()}
         return None
     except Exception as e:
         st.error(f"Error: {e}")
@@ -690,42 +905,85 @@ def api_post(path):
 
 # ─── Helper renderers ─────────────────────────────────────────────────────────
 
+# Only five severities exist, so their badge HTML is rendered once at import
+_BADGE_HTML = {
+    sev: f'<span class="badge" style="color:{c};'
+         f'background:{bg};border-color:{bd};">{sev}</span>'
+    for sev, (c, bg, bd) in SEVERITY_STYLE.items()
+}
+
+
 def badge(severity):
-    c  = SEVERITY_COLORS.get(severity, "#64748b")
-    bg = SEVERITY_BG.get(severity, "#f8fafc")
-    bd = SEVERITY_BORDER.get(severity, "#e2e8f0")
-    return f'<span class="badge" style="color:{c};background:{bg};border-color:{bd};">{severity}</span>'
+    html = _BADGE_HTML.get(severity)
+    if html is None:
+        html = (f'<span class="badge" style="color:#64748b;background:#f8fafc;'
+                f'border-color:#e2e8f0;">{severity}</span>')
+    return html
+
+
+TTYPE_PALETTE = {
+    "not_null":          ("#0284c7", "#e0f2fe"),
+    "unique":            ("#7c3aed", "#ede9fe"),
+    "accepted_values":   ("#0891b2", "#ecfeff"),
+    "row_count_between": ("#059669", "#ecfdf5"),
+    "value_between":     ("#d97706", "#fffbeb"),
+}
+TTYPE_ICONS = {
+    "not_null":          "🚫",
+    "unique":            "🔑",
+    "accepted_values":   "📋",
+    "row_count_between": "📊",
+    "value_between":     "📏",
+}
 
 
 def ttype_badge(test_type):
-    palette = {
-        "not_null":          ("#0284c7", "#e0f2fe"),
-        "unique":            ("#7c3aed", "#ede9fe"),
-        "accepted_values":   ("#0891b2", "#ecfeff"),
-        "row_count_between": ("#059669", "#ecfdf5"),
-        "value_between":     ("#d97706", "#fffbeb"),
-    }
-    c, bg = palette.get(test_type, ("#64748b", "#f8fafc"))
+    c, bg = TTYPE_PALETTE.get(test_type, ("#64748b", "#f8fafc"))
     label = test_type.replace("_", " ")
     return f'<span class="ttype" style="color:{c};background:{bg};">{label}</span>'
 
 
 # ─── Sidebar ──────────────────────────────────────────────────────────────────
-
-with st.sidebar:
-    st.markdown("""
+# Both brand variants are rendered once at import — the rerun path only
+# picks one by the health-check result, no per-rerun string formatting
+
+_STATUS_HTML = {
+    True: (
+        '<div class="sb-status">'
+        '<div class="sb-status-dot"></div>'
+        '<span class="sb-status-text">All systems operational</span>'
+        '</div>'
+    ),
+    False: (
+        '<div class="sb-status" style="background:rgba(220,38,38,0.1);border-color:rgba(220,38,38,0.2);">'
+        '<div class="sb-status-dot" style="background:#dc2626;box-shadow:0 0 6px #dc2626;"></div>'
+        '<span class="sb-status-text" style="color:#dc2626 !important;">Warehouse unavailable</span>'
+        '</div>'
+    ),
+}
+_BRAND_HTML = {
+    healthy: f"""
     <div class="sb-brand">
         <div class="sb-logo">
             <div class="sb-logo-icon">🔍</div>
             <div class="sb-logo-text">DQ Copilot</div>
         </div>
         <div class="sb-sub">AI-Powered Data Observability</div>
-        <div class="sb-status">
-            <div class="sb-status-dot"></div>
-            <span class="sb-status-text">All systems operational</span>
+        {status}
+    </div>
+    """
+    for healthy, status in _STATUS_HTML.items()
+}
+_FOOTER_HTML = """
+    <div style="margin-top:40px;padding:0 16px;">
+        <div style="font-size:0.7rem;color:#334155;text-align:center;line-height:1.8;">
+            Python · DuckDB · Claude AI
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+with st.sidebar:
+    st.markdown(_BRAND_HTML[_ping()], unsafe_allow_html=True)
 
     page = st.radio(
         "Navigate",
@@ -734,20 +992,19 @@ with st.sidebar:
         label_visibility="collapsed"
     )
 
-    st.markdown("""
-    <div style="margin-top:40px;padding:0 16px;">
-        <div style="font-size:0.7rem;color:#334155;text-align:center;line-height:1.8;">
-            Python · DuckDB · Claude AI
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    if st.button("⟳ Refresh data", use_container_width=True):
+        st.cache_data.clear()
+        st.rerun()
+
+    st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
 
 
 # ══════════════════════════════════════════════════════════
 # PAGE 1 — DASHBOARD
 # ══════════════════════════════════════════════════════════
 
-if page == "📊 Dashboard":
+@st.fragment
+def _page_dashboard():
 
     st.markdown("""
     <div class="page-header">
@@ -758,7 +1015,8 @@ if page == "📊 Dashboard":
     </div>
     """, unsafe_allow_html=True)
 
-    summary = api_get("/api/summary")
+    dashboard = api_get("/api/dashboard") or {}
+    summary   = dashboard.get("summary")
     if summary:
         c = summary.get("anomalies_critical", 0)
         crit_class = "critical" if c > 0 else ""
@@ -796,27 +1054,30 @@ if page == "📊 Dashboard":
 
     with col_left:
         st.markdown('<div class="section-title">Table Health</div>', unsafe_allow_html=True)
-        tables  = api_get("/api/tables")
-        reports = api_get("/api/reports")
+        tables  = dashboard.get("tables")
+        reports = dashboard.get("reports")
 
         if tables and reports:
             anomalous_map = {r["table"]: r["severity"] for r in reports.get("reports", [])}
+            cards = []
             for t in tables.get("tables", []):
                 name     = t["table"]
                 severity = anomalous_map.get(name, "OK")
                 color    = SEVERITY_COLORS.get(severity, "#16a34a")
                 bdg      = "" if severity == "OK" else badge(severity)
-                st.markdown(f"""
+                cards.append(f"""
                 <div class="table-card">
                     <div class="status-dot" style="background:{color};"></div>
                     <div class="table-name">{name}</div>
                     <div class="table-meta">{t['row_count']:,} rows · {t['col_count']} cols</div>
                     {bdg}
                 </div>
-                """, unsafe_allow_html=True)
+                """)
+            # One st.markdown for all cards — one delta message instead of N
+            st.markdown("".join(cards), unsafe_allow_html=True)
 
     with col_right:
-        anomalies = api_get("/api/anomalies")
+        anomalies = dashboard.get("anomalies")
 
         if anomalies and anomalies["total"] > 0:
             n_c = anomalies.get("critical", 0)
@@ -832,10 +1093,14 @@ if page == "📊 Dashboard":
             st.bar_chart(chart_df, color="#2563eb", height=170)
 
             st.markdown('<div class="section-title" style="margin-top:20px;">Recent Anomalies</div>', unsafe_allow_html=True)
-            df     = pd.DataFrame(anomalies["anomalies"])
-            recent = df.tail(6)[["table","column","metric","severity","pct_change"]].copy()
-            recent["pct_change"] = recent["pct_change"].apply(lambda x: f"{float(x)*100:.1f}%")
-            st.dataframe(recent, use_container_width=True, hide_index=True)
+            # The payload carries a pre-sliced tail — rendering cost scales
+            # with the 6 displayed rows, not the whole history
+            recent = [
+                {"table": r["table"], "column": r["column"], "metric": r["metric"],
+                 "severity": r["severity"], "pct_change": f"{float(r['pct_change'])*100:.1f}%"}
+                for r in anomalies["recent"]
+            ]
+            st.dataframe(pd.DataFrame(recent), use_container_width=True, hide_index=True)
         else:
             st.markdown('<div class="section-title">Recent Anomalies</div>', unsafe_allow_html=True)
             st.success("✅ All clear — no anomalies detected")
@@ -845,7 +1110,8 @@ if page == "📊 Dashboard":
 # PAGE 2 — ANOMALIES
 # ══════════════════════════════════════════════════════════
 
-elif page == "🚨 Anomalies":
+@st.fragment
+def _page_anomalies():
 
     st.markdown("""
     <div class="page-header">
@@ -876,26 +1142,22 @@ elif page == "🚨 Anomalies":
                 col1, col2 = st.columns([3, 1])
 
                 with col1:
-                    st.markdown(
+                    # One markdown per column — the LLM text is escaped
+                    # since it lands in an unsafe_allow_html block
+                    left_html = (
                         f'<div class="rpt-label">What happened</div>'
-                        f'<div class="rpt-text">{report.get("explanation", "N/A")}</div>',
-                        unsafe_allow_html=True
-                    )
-                    st.markdown(
+                        f'<div class="rpt-text">{html.escape(report.get("explanation", "N/A"))}</div>'
                         f'<div class="rpt-label">Root cause</div>'
-                        f'<div class="rpt-text">{report.get("root_cause", "N/A")}</div>',
-                        unsafe_allow_html=True
+                        f'<div class="rpt-text">{html.escape(report.get("root_cause", "N/A"))}</div>'
                     )
                     fixes = report.get("fixes", [])
                     if fixes:
                         items = "".join(
-                            f'<div class="fix-row"><div class="fix-num">{i}</div><div>{f}</div></div>'
+                            f'<div class="fix-row"><div class="fix-num">{i}</div><div>{html.escape(f)}</div></div>'
                             for i, f in enumerate(fixes, 1)
                         )
-                        st.markdown(
-                            f'<div class="rpt-label">Suggested fixes</div>{items}',
-                            unsafe_allow_html=True
-                        )
+                        left_html += f'<div class="rpt-label">Suggested fixes</div>{items}'
+                    st.markdown(left_html, unsafe_allow_html=True)
 
                 with col2:
                     detected = report.get("generated_at", "")[:19].replace("T", " ")
@@ -917,7 +1179,8 @@ elif page == "🚨 Anomalies":
 # PAGE 3 — SCHEMA MONITOR
 # ══════════════════════════════════════════════════════════
 
-elif page == "📐 Schema Monitor":
+@st.fragment
+def _page_schema_monitor():
 
     st.markdown("""
     <div class="page-header">
@@ -947,10 +1210,12 @@ elif page == "📐 Schema Monitor":
 
             with col1:
                 st.markdown('<div class="section-title">Current Schema</div>', unsafe_allow_html=True)
-                df = pd.DataFrame(schema["current_schema"])
-                if not df.empty:
-                    display_cols = [c for c in ["column_name","column_type","null","key","default"] if c in df.columns]
-                    st.dataframe(df[display_cols], use_container_width=True, hide_index=True)
+                if schema["current_schema"]:
+                    # Arrow table goes straight to Streamlit's Arrow serializer
+                    # — no pandas block-manager intermediate
+                    tbl = pa.Table.from_pylist(schema["current_schema"])
+                    display_cols = [c for c in ["column_name","column_type","null","key","default"] if c in tbl.column_names]
+                    st.dataframe(tbl.select(display_cols), use_container_width=True, hide_index=True)
 
             with col2:
                 st.markdown(
@@ -958,7 +1223,7 @@ elif page == "📐 Schema Monitor":
                     unsafe_allow_html=True
                 )
                 if schema["drift_history"]:
-                    st.dataframe(pd.DataFrame(schema["drift_history"]), use_container_width=True, hide_index=True)
+                    st.dataframe(pa.Table.from_pylist(schema["drift_history"]), use_container_width=True, hide_index=True)
                 else:
                     st.success("✅ No drift events recorded for this table")
 
@@ -967,7 +1232,8 @@ elif page == "📐 Schema Monitor":
 # PAGE 4 — TESTS
 # ══════════════════════════════════════════════════════════
 
-elif page == "🧪 Tests":
+@st.fragment
+def _page_tests():
 
     st.markdown("""
     <div class="page-header">
@@ -992,27 +1258,44 @@ elif page == "🧪 Tests":
         )
         st.markdown("---")
 
+        idx = _test_indices(_file_sig(TESTS_JSON))
         fc1, fc2 = st.columns(2)
         with fc1:
-            all_tests   = tests.get("tests", [])
-            table_names = sorted(set(t["table"] for t in all_tests))
-            sel_table   = st.selectbox("Filter by table", ["All"] + table_names)
-        filtered = all_tests if sel_table == "All" else [t for t in all_tests if t["table"] == sel_table]
-
+            sel_table = st.selectbox("Filter by table", ["All"] + idx["table_names"])
         with fc2:
-            test_types = sorted(set(t["test_type"] for t in filtered))
-            sel_type   = st.selectbox("Filter by test type", ["All"] + test_types)
-        if sel_type != "All":
-            filtered = [t for t in filtered if t["test_type"] == sel_type]
+            sel_type = st.selectbox("Filter by test type",
+                                    ["All"] + idx["types_for"].get(sel_table, []))
+        if sel_table == "All" and sel_type == "All":
+            filtered = idx["all"]
+        elif sel_type == "All":
+            filtered = idx["by_table"].get(sel_table, [])
+        elif sel_table == "All":
+            filtered = idx["by_type"].get(sel_type, [])
+        else:
+            filtered = idx["by_pair"].get((sel_table, sel_type), [])
 
         st.markdown(
             f'<p style="color:#64748b;font-size:0.82rem;margin:10px 0 14px;">Showing <strong style="color:#0f172a;">{len(filtered)}</strong> tests</p>',
             unsafe_allow_html=True
         )
 
-        icons = {"not_null":"🚫","unique":"🔑","accepted_values":"📋","row_count_between":"📊","value_between":"📏"}
-        for test in filtered:
-            with st.expander(f"{icons.get(test['test_type'],'🧪')}  {test['plain_english']}"):
+        if filtered:
+            # One Arrow-backed dataframe for the whole list — the grid
+            # virtualizes rows, so frontend cost no longer scales with the
+            # test count the way one expander per test did. Details for the
+            # selected row render below.
+            event = st.dataframe(
+                pa.Table.from_pylist([
+                    {"test": f"{TTYPE_ICONS.get(t['test_type'], '🧪')}  {t['plain_english']}",
+                     "table": t["table"], "column": t["column"],
+                     "test_type": t["test_type"]}
+                    for t in filtered
+                ]),
+                use_container_width=True, hide_index=True,
+                on_select="rerun", selection_mode="single-row",
+            )
+            if event.selection.rows:
+                test = filtered[event.selection.rows[0]]
                 c1, c2 = st.columns([1, 1])
                 with c1:
                     st.markdown(
@@ -1022,24 +1305,26 @@ elif page == "🧪 Tests":
                         unsafe_allow_html=True
                     )
                 with c2:
-                    st.markdown(
+                    c2_html = (
                         f'<div class="rpt-label">Why generated</div>'
-                        f'<div style="font-size:0.85rem;color:#374151;">{test.get("reason","")}</div>',
-                        unsafe_allow_html=True
+                        f'<div style="font-size:0.85rem;color:#374151;">{test.get("reason","")}</div>'
                     )
                     if test.get("parameters"):
-                        st.markdown(
+                        c2_html += (
                             f'<div class="rpt-label" style="margin-top:10px;">Parameters</div>'
-                            f'<code style="font-size:0.8rem;color:#2563eb;">{test["parameters"]}</code>',
-                            unsafe_allow_html=True
+                            f'<code style="font-size:0.8rem;color:#2563eb;">{test["parameters"]}</code>'
                         )
+                    st.markdown(c2_html, unsafe_allow_html=True)
+            else:
+                st.caption("Select a row to see why the test was generated.")
 
 
 # ══════════════════════════════════════════════════════════
 # PAGE 5 — LINEAGE GRAPH
 # ══════════════════════════════════════════════════════════
 
-elif page == "🗺️ Lineage Graph":
+@st.fragment
+def _page_lineage():
 
     st.markdown("""
     <div class="page-header">
@@ -1053,13 +1338,13 @@ elif page == "🗺️ Lineage Graph":
     lineage = api_get("/api/lineage")
     if lineage:
         if lineage["anomalous_count"] > 0:
-            for node in [n for n in lineage["nodes"] if not n["healthy"]]:
-                st.markdown(
-                    f'<div style="background:#fef2f2;border:1px solid #fca5a5;border-left:4px solid #dc2626;'
-                    f'border-radius:8px;padding:10px 14px;margin-bottom:8px;font-size:0.875rem;color:#dc2626;font-weight:600;">'
-                    f'⚠️ {node["id"]} — {badge(node["severity"])} anomaly active</div>',
-                    unsafe_allow_html=True
-                )
+            # One markdown for all warning rows instead of one per node
+            st.markdown("".join(
+                f'<div style="background:#fef2f2;border:1px solid #fca5a5;border-left:4px solid #dc2626;'
+                f'border-radius:8px;padding:10px 14px;margin-bottom:8px;font-size:0.875rem;color:#dc2626;font-weight:600;">'
+                f'⚠️ {node["id"]} — {badge(node["severity"])} anomaly active</div>'
+                for node in lineage["nodes"] if not node["healthy"]
+            ), unsafe_allow_html=True)
         else:
             st.markdown(
                 '<div style="background:#f0fdf4;border:1px solid #86efac;border-radius:8px;'
@@ -1071,8 +1356,7 @@ elif page == "🗺️ Lineage Graph":
     st.markdown("---")
 
     if os.path.exists(LINEAGE_PATH):
-        with open(LINEAGE_PATH, "r") as f:
-            html_content = f.read()
+        html_content = _lineage_html(LINEAGE_PATH, _file_sig(LINEAGE_PATH))
         st.components.v1.html(html_content, height=750, scrolling=False)
     else:
         st.warning("⚠️ Lineage graph not generated yet.")
@@ -1083,7 +1367,39 @@ elif page == "🗺️ Lineage Graph":
 # PAGE 6 — RUN PIPELINE
 # ══════════════════════════════════════════════════════════
 
-elif page == "▶️ Run Pipeline":
+@st.fragment(run_every=2)
+def _pipeline_status():
+    """Polls the background full-pipeline job and renders its outcome."""
+    fut = st.session_state.get("pipeline_job")
+    harvested = False
+    if fut is not None and fut.done():
+        del st.session_state["pipeline_job"]
+        try:
+            st.session_state["pipeline_result"] = fut.result()
+        except Exception as e:
+            st.session_state["pipeline_result"] = {"error": str(e)}
+        harvested = True
+        # Reports, anomaly history and summary counts all changed
+        _invalidate(_load_json, _load_csv, _summary)
+    elif fut is not None:
+        st.info("⏳ Full pipeline running — calling Claude API in the background...")
+        return
+
+    result = st.session_state.get("pipeline_result")
+    if not result:
+        return
+    if "error" in result:
+        st.error(f"Error: {result['error']}")
+    elif result["count"] > 0:
+        st.success(f"✅ {result['message']}")
+        if harvested:
+            st.balloons()
+    else:
+        st.info(f"ℹ️ {result['message']}")
+
+
+@st.fragment
+def _page_run_pipeline():
 
     st.markdown("""
     <div class="page-header">
@@ -1094,65 +1410,53 @@ elif page == "▶️ Run Pipeline":
     </div>
     """, unsafe_allow_html=True)
 
-    col1, arr1, col2, arr2, col3 = st.columns([5, 1, 5, 1, 5])
-
-    with col1:
-        st.markdown("""
+    # The three cards and arrows are static — one grid block, one message;
+    # only the buttons below need to be real widgets
+    st.markdown("""
+    <div class="pipe-grid">
         <div class="pipe-card">
             <div class="pipe-step">Step 1</div>
             <div class="pipe-icon">📐</div>
             <div class="pipe-title">Schema Monitor</div>
             <div class="pipe-desc">Compares current table schemas against the saved baseline to detect column additions, drops, and type changes.</div>
         </div>
-        """, unsafe_allow_html=True)
-        st.markdown("<div style='height:10px'></div>", unsafe_allow_html=True)
+        <div class="pipe-arrow">→</div>
+        <div class="pipe-card">
+            <div class="pipe-step">Step 2</div>
+            <div class="pipe-icon">📊</div>
+            <div class="pipe-title">Anomaly Detector</div>
+            <div class="pipe-desc">Uses Z-score analysis on 30-day history to flag statistical anomalies in row counts, null rates, and distributions.</div>
+        </div>
+        <div class="pipe-arrow">→</div>
+        <div class="pipe-card">
+            <div class="pipe-step">Step 3 · AI</div>
+            <div class="pipe-icon">🤖</div>
+            <div class="pipe-title">Full Pipeline</div>
+            <div class="pipe-desc">Runs detection, calls Claude AI to generate root-cause analysis and fix recommendations, then sends Slack alerts.</div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col1, _, col2, _, col3 = st.columns([5, 1, 5, 1, 5])
+
+    with col1:
         if st.button("Run Schema Monitor", use_container_width=True):
             with st.spinner("Running..."):
                 result = api_post("/api/run/schema-monitor")
             if result:
                 (st.warning if result["count"] > 0 else st.success)(f"{'⚠️' if result['count'] > 0 else '✅'} {result['message']}")
 
-    with arr1:
-        st.markdown('<div class="pipe-arrow">→</div>', unsafe_allow_html=True)
-
     with col2:
-        st.markdown("""
-        <div class="pipe-card">
-            <div class="pipe-step">Step 2</div>
-            <div class="pipe-icon">📊</div>
-            <div class="pipe-title">Anomaly Detector</div>
-            <div class="pipe-desc">Uses Z-score analysis on 30-day history to flag statistical anomalies in row counts, null rates, and distributions.</div>
-        </div>
-        """, unsafe_allow_html=True)
-        st.markdown("<div style='height:10px'></div>", unsafe_allow_html=True)
         if st.button("Run Anomaly Detector", use_container_width=True):
             with st.spinner("Running..."):
                 result = api_post("/api/run/anomaly-detector")
             if result:
                 (st.warning if result["count"] > 0 else st.success)(f"{'⚠️' if result['count'] > 0 else '✅'} {result['message']}")
 
-    with arr2:
-        st.markdown('<div class="pipe-arrow">→</div>', unsafe_allow_html=True)
-
     with col3:
-        st.markdown("""
-        <div class="pipe-card">
-            <div class="pipe-step">Step 3 · AI</div>
-            <div class="pipe-icon">🤖</div>
-            <div class="pipe-title">Full Pipeline</div>
-            <div class="pipe-desc">Runs detection, calls Claude AI to generate root-cause analysis and fix recommendations, then sends Slack alerts.</div>
-        </div>
-        """, unsafe_allow_html=True)
-        st.markdown("<div style='height:10px'></div>", unsafe_allow_html=True)
         if st.button("Run Full Pipeline", type="primary", use_container_width=True):
-            with st.spinner("Calling Claude API..."):
-                result = api_post("/api/run/full-pipeline")
-            if result:
-                if result["count"] > 0:
-                    st.success(f"✅ {result['message']}")
-                    st.balloons()
-                else:
-                    st.info(f"ℹ️ {result['message']}")
+            api_post("/api/run/full-pipeline")
+        _pipeline_status()
 
     st.markdown("---")
     st.markdown(
@@ -1169,3 +1473,21 @@ python src/lineage/lineage_graph.py
 # Reset when done:
 python tests/inject_anomaly.py --reset
 """, language="bash")
+
+
+# ══════════════════════════════════════════════════════════
+# DISPATCH
+# ══════════════════════════════════════════════════════════
+# Each page runs inside an st.fragment, so interactions within a page
+# (buttons, expanders) rerun only that fragment — not the whole script.
+
+_PAGES = {
+    "📊 Dashboard":      _page_dashboard,
+    "🚨 Anomalies":      _page_anomalies,
+    "📐 Schema Monitor": _page_schema_monitor,
+    "🧪 Tests":          _page_tests,
+    "🗺️ Lineage Graph":  _page_lineage,
+    "▶️ Run Pipeline":   _page_run_pipeline,
+}
+
+_PAGES[page]()
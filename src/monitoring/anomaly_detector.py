@@ -30,6 +30,8 @@ from dataclasses import dataclass, field
 import duckdb
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.feather as feather
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
@@ -293,6 +295,13 @@ def save_anomalies(anomalies: list[Anomaly]):
         combined = new_df
 
     combined.to_csv(ANOMALY_PATH, index=False)
+
+    # Feather sibling for fast columnar loads (the CSV stays for humans)
+    feather_path = os.path.splitext(ANOMALY_PATH)[0] + ".feather"
+    feather.write_feather(
+        pa.Table.from_pandas(combined, preserve_index=False),
+        feather_path, compression="zstd",
+    )
     print(f"\n  💾 Anomaly events saved → {ANOMALY_PATH}")
 
 
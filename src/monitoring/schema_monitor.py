@@ -21,6 +21,8 @@ from dataclasses import dataclass, field
 
 import duckdb
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
@@ -159,6 +161,13 @@ def save_to_history(all_drifts: list[SchemaDrift]):
         combined = new_df
 
     combined.to_csv(SCHEMA_PATH, index=False)
+
+    # Feather sibling for fast columnar loads (the CSV stays for humans)
+    feather_path = os.path.splitext(SCHEMA_PATH)[0] + ".feather"
+    feather.write_feather(
+        pa.Table.from_pandas(combined, preserve_index=False),
+        feather_path, compression="zstd",
+    )
     print(f"\n  💾 Drift events saved → {SCHEMA_PATH}")
 
 